@@ -1,16 +1,23 @@
 """
-Streamlit app to annotate a single radiology report using RadGraph loaded from Hugging Face.
+Streamlit app to annotate radiology reports using RadGraph loaded from Hugging Face.
 
 Usage:
     streamlit run app.py
 """
 import streamlit as st
-import pandas as pd
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import io
 import json
 import os
-import traceback
+import threading
 
-from radgraph_runner import load_radgraph_model, annotate_reports
+try:
+    import orjson
+except Exception:
+    orjson = None  # optional dependency; falls back to stdlib json
+
+from radgraph_runner import load_radgraph_model, annotate_reports, release_model_memory, resolve_quantize
 
 st.set_page_config(page_title="RadGraph (HF) Demo", layout="wide")
 
@@ -18,7 +25,7 @@ st.title("RadGraph — HF-backed inference demo")
 
 st.markdown(
     """
-Enter a radiology report and press **Annotate**. The app will:
+Enter a radiology report (or several, one per line, in batch mode) and press **Annotate**. The app will:
 - authenticate to Hugging Face using `HUGGINGFACEHUB_API_TOKEN` from `.env` (or env),
 - load the RadGraph model (first time may download using your token),
 - return processed RadGraph JSON plus entity & relation tables.
@@ -32,6 +39,18 @@ with st.sidebar:
     st.header("Settings")
     model_id = st.text_input("RadGraph HF model id / artifact alias", value=os.environ.get("RADGRAPH_MODEL_ID", "modern-radgraph-xl"))
     show_raw = st.checkbox("Show raw JSON output", value=True)
+    batch_mode = st.checkbox("Batch mode (one report per line)", value=False)
+    batch_size = st.selectbox("Batch size", [8, 16, 32, 64, 128, "auto"], index=1,
+                              help="'auto' measures throughput once per model and picks the fastest size.")
+    backend = st.selectbox("Inference backend", ["torch", "onnx"], index=0,
+                           help="'onnx' runs the transformer through ONNX Runtime (needs optimum[onnxruntime]).")
+    compile_model = st.checkbox("Compile model (torch.compile, slow first run)", value=False)
+    # normalized up front: on GPU hosts the flag is a no-op and must not split the caches
+    pipeline = st.checkbox("Pipeline tokenization (GPU only, experimental)", value=False,
+                           help="Tokenize the next batch on a worker thread while the current one runs.")
+    quantize = resolve_quantize(st.checkbox("Quantize to int8 (CPU only)", value=True))
+    free_model = st.button("Switch model (free VRAM)",
+                           help="Drop the current model from memory; it reloads on the next Annotate.")
     st.write("Make sure your HUGGINGFACEHUB_API_TOKEN is set in environment or .env.")
 
 # Input area
@@ -44,87 +63,217 @@ annotate_btn = st.button("Annotate")
 
 # cached loader to keep model in memory across reruns
 @st.cache_resource(show_spinner=False)
-def get_model_cached(mid):
-    return load_radgraph_model(model_id=mid)
+def get_model_cached(mid, compile_model=False, backend="torch", quantize=True):
+    return load_radgraph_model(model_id=mid, compile_model=compile_model, backend=backend, quantize=quantize)
+
+@st.cache_resource(show_spinner=False)
+def _model_sessions():
+    # process-wide: model settings -> ids of the sessions using them
+    return {"lock": threading.Lock(), "users": {}}
+
+def _session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+def _is_live(sid):
+    # closed tabs and browser refreshes leave sessions behind that never say goodbye
+    return runtime.exists() and runtime.get_instance().is_active_session(sid)
+
+# cache_resource never evicts on its own, and its entries are shared by every session on
+# the same settings. When this session moves off a model (new settings, or the "free VRAM"
+# button), every model that no live session uses any more is dropped from the cache.
+active_model = (model_id, compile_model, backend, quantize)
+previous_model = st.session_state.get('active_model')
+session_id = _session_id()
+sessions = _model_sessions()
+evicted = []
+with sessions["lock"]:
+    users = sessions["users"]
+    if previous_model is not None and previous_model != active_model:
+        users.get(previous_model, set()).discard(session_id)
+    if free_model:
+        users.get(active_model, set()).discard(session_id)
+    else:
+        users.setdefault(active_model, set()).add(session_id)
+    if free_model or previous_model != active_model:
+        for key in list(users):
+            users[key] = {sid for sid in users[key] if _is_live(sid)}
+            if not users[key]:
+                del users[key]
+                # under the lock, so no other session can pick the entry up meanwhile
+                get_model_cached.clear(*key)
+                evicted.append(key)
+    if free_model:
+        if active_model in users:
+            st.info("The current model is still in use by another session, so it was not freed.")
+        users.setdefault(active_model, set()).add(session_id)
+if evicted:
+    release_model_memory()
+st.session_state['active_model'] = active_model
+
+class _FailedReports(Exception):
+    """
+    Raised by _cached_annotate when some reports came back as error entries, so that
+    st.cache_data does not memoize the failure. `outputs` still holds every result.
+    """
+    def __init__(self, outputs):
+        super().__init__("annotation failed for some reports")
+        self.outputs = outputs
 
+# memoize processed output so reruns with the same input skip the model forward pass;
+# `_batch_size` and `_pipeline` are excluded from the cache key since they do not change the output
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_annotate(mid, reports, _batch_size, compile_model=False, backend="torch", quantize=True, _pipeline=False):
+    model = get_model_cached(mid, compile_model, backend, quantize)
+    outputs = annotate_reports(model, list(reports), batch_size=_batch_size, pipeline=_pipeline)
+    if any(isinstance(o, dict) and "error" in o for o in outputs):
+        raise _FailedReports(outputs)
+    return outputs
+
+# candidate keys for an entity's surface text, in order of preference
+_TEXT_KEYS = ("text", "tokens", "tokens_text", "tokens_text_joined")
+_ENTITY_COLUMNS = ["id", "text", "label", "start", "end"]
+
+def _entities_frame(entities):
+    """
+    Build the entity table straight from the {id: entity} mapping.
+    Text falls back through _TEXT_KEYS, skipping empty values.
+    """
+    # pandas is a heavy import; only pay for it when there is a table to build
+    import pandas as pd
+
+    df = pd.DataFrame.from_dict(entities, orient="index")
+    for col in _TEXT_KEYS + ("label", "start", "end"):
+        if col not in df:
+            df[col] = None
+
+    text = pd.Series("", index=df.index, dtype=object)
+    for k in reversed(_TEXT_KEYS):
+        text = df[k].where(df[k].notna() & df[k].astype(bool), text)
+    df["text"] = text
+
+    # the id column is the entity's key, as before; drop any "id" field the entity carries
+    df = df.drop(columns="id", errors="ignore")
+    df.index.name = "id"
+    return df.reset_index()[_ENTITY_COLUMNS].fillna("")
+
+def _csv_bytes(df):
+    # pandas encodes straight into the buffer, no intermediate str copy
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, encoding='utf-8')
+    return buf.getvalue()
+
+def _json_bytes(obj):
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # type orjson cannot serialize; use stdlib below
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+def render_annotation(model_output, key):
+    """
+    Render tables, raw JSON and download buttons for a single processed annotation.
+    `key` disambiguates widget ids when several reports are shown on one page.
+    """
+    if show_raw:
+        st.subheader("Raw model output")
+        st.json(model_output)
+
+    # Attempt to extract entities and relations in common shapes
+    df_ents = None
+    relations = []
+
+    if isinstance(model_output, dict):
+        # common "processed annotations" format: 'entities' is a dict
+        if 'entities' in model_output and isinstance(model_output['entities'], dict):
+            df_ents = _entities_frame(model_output['entities'])
+        # fallback: maybe 'ner' + 'sentences' format
+        elif 'ner' in model_output and 'sentences' in model_output:
+            # simple re-use of radgraph parsing conventions could be added here
+            pass
+
+        # relations
+        if 'relations' in model_output and isinstance(model_output['relations'], list):
+            for r in model_output['relations']:
+                if isinstance(r, dict):
+                    src = r.get('source') or r.get('from') or r.get('head')
+                    tgt = r.get('target') or r.get('to') or r.get('tail')
+                    lbl = r.get('label') or r.get('type') or ""
+                    relations.append({"source": src, "target": tgt, "label": lbl})
+                elif isinstance(r, (list, tuple)) and len(r) >= 3:
+                    relations.append({"source": r[0], "target": r[1], "label": r[2]})
+
+    # Display entities and relations
+    if df_ents is not None and not df_ents.empty:
+        st.subheader("Entities")
+        st.dataframe(df_ents)
+        st.download_button("Download Entities CSV", _csv_bytes(df_ents),
+                           file_name="radgraph_entities.csv", mime="text/csv", key=f"ents_csv_{key}")
+    else:
+        st.info("No entities found in recognized format. Inspect raw JSON.")
+
+    if relations:
+        st.subheader("Relations")
+        import pandas as pd
+        df_rels = pd.DataFrame(relations)
+        st.dataframe(df_rels)
+        st.download_button("Download Relations CSV", _csv_bytes(df_rels),
+                           file_name="radgraph_relations.csv", mime="text/csv", key=f"rels_csv_{key}")
+
+    # Always provide full JSON download
+    st.download_button("Download Raw JSON", _json_bytes(model_output),
+                       file_name="radgraph_output.json", mime="application/json", key=f"json_{key}")
+
+if batch_mode:
+    reports = [line.strip() for line in report_text.splitlines() if line.strip()]
+else:
+    reports = [report_text] if report_text.strip() else []
+
+# the same settings _cached_annotate keys on: any of them changes the output
+current_input = (model_id, tuple(reports), compile_model, backend, quantize)
+
+# Inference only runs on an Annotate click; results live in session_state so other
+# widget changes (e.g. toggling raw JSON) just re-render them.
 if annotate_btn:
-    if not report_text.strip():
+    if not reports:
         st.warning("Please enter a report.")
     else:
         try:
             st.info("Loading model (cached if previously loaded) and running inference...")
 
-            model = get_model_cached(model_id)
-            outputs = annotate_reports(model, [report_text])
-
-            if not outputs:
-                st.error("Model returned empty output. See logs / raw output.")
-                st.stop()
-
-            # pick first output (we passed a single report)
-            model_output = outputs[0]
-
-            if show_raw:
-                st.subheader("Raw model output")
-                st.json(model_output)
-
-            # Attempt to extract entities and relations in common shapes
-            entities = []
-            relations = []
-
-            if isinstance(model_output, dict):
-                # common "processed annotations" format: 'entities' is a dict
-                if 'entities' in model_output and isinstance(model_output['entities'], dict):
-                    for eid, ent in model_output['entities'].items():
-                        text = ent.get("text") or ent.get("tokens") or ent.get("tokens_text") or ent.get("tokens_text_joined") or ""
-                        label = ent.get("label") or ""
-                        start = ent.get("start")
-                        end = ent.get("end")
-                        entities.append({
-                            "id": eid,
-                            "text": text,
-                            "label": label,
-                            "start": start,
-                            "end": end
-                        })
-                # fallback: maybe 'ner' + 'sentences' format
-                elif 'ner' in model_output and 'sentences' in model_output:
-                    # simple re-use of radgraph parsing conventions could be added here
-                    pass
-
-                # relations
-                if 'relations' in model_output and isinstance(model_output['relations'], list):
-                    for r in model_output['relations']:
-                        if isinstance(r, dict):
-                            src = r.get('source') or r.get('from') or r.get('head')
-                            tgt = r.get('target') or r.get('to') or r.get('tail')
-                            lbl = r.get('label') or r.get('type') or ""
-                            relations.append({"source": src, "target": tgt, "label": lbl})
-                        elif isinstance(r, (list, tuple)) and len(r) >= 3:
-                            relations.append({"source": r[0], "target": r[1], "label": r[2]})
-
-            # Display entities and relations
-            if entities:
-                st.subheader("Entities")
-                df_ents = pd.DataFrame(entities)
-                st.dataframe(df_ents)
-                st.download_button("Download Entities CSV", df_ents.to_csv(index=False).encode('utf-8'),
-                                   file_name="radgraph_entities.csv", mime="text/csv")
-            else:
-                st.info("No entities found in recognized format. Inspect raw JSON.")
-
-            if relations:
-                st.subheader("Relations")
-                df_rels = pd.DataFrame(relations)
-                st.dataframe(df_rels)
-                st.download_button("Download Relations CSV", df_rels.to_csv(index=False).encode('utf-8'),
-                                   file_name="radgraph_relations.csv", mime="text/csv")
-
-            # Always provide full JSON download
-            st.download_button("Download Raw JSON", json.dumps(model_output, indent=2).encode('utf-8'),
-                               file_name="radgraph_output.json", mime="application/json")
-
-            st.success("Annotation complete.")
+            # all reports go through a single batched call
+            bs = None if batch_size == "auto" else int(batch_size)
+            try:
+                outputs = _cached_annotate(model_id, tuple(reports), bs, compile_model, backend, quantize,
+                                           _pipeline=pipeline)
+            except _FailedReports as e:
+                outputs = e.outputs
+                st.warning("Some reports failed (see their raw JSON); press **Annotate** to retry them.")
+            st.session_state['last_out'] = outputs
+            st.session_state['last_input'] = current_input
         except Exception as e:
+            st.session_state.pop('last_out', None)
             st.error("Error during annotation. See traceback below.")
+            import traceback
             st.text(traceback.format_exc())
+
+outputs = st.session_state.get('last_out')
+if outputs is not None:
+    try:
+        if st.session_state.get('last_input') != current_input:
+            st.caption("Showing results for the previous input; press **Annotate** to refresh.")
+
+        if not outputs:
+            st.error("Model returned empty output. See logs / raw output.")
+        else:
+            for idx, model_output in enumerate(outputs):
+                if len(outputs) > 1:
+                    st.header(f"Report {idx + 1}")
+                render_annotation(model_output, key=str(idx))
+
+            st.success("Annotation complete.")
+    except Exception:
+        st.error("Error while displaying the annotation. See traceback below.")
+        import traceback
+        st.text(traceback.format_exc())
@@ -7,8 +7,15 @@ and run inference while normalizing output shapes.
 This module intentionally keeps imports lazy to avoid heavy startup cost until needed.
 """
 import os
+import gc
 import logging
-from typing import List, Dict, Any
+import contextlib
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -26,6 +33,75 @@ except Exception:
 
 from huggingface_hub import login as hf_login
 
+# get_radgraph_processed_annotations, resolved once on first use (False if unavailable)
+_PROC_FN = None
+
+def _get_proc_fn():
+    """
+    Return radgraph's get_radgraph_processed_annotations helper, or None if it cannot be imported.
+    The import is attempted only once per process.
+    """
+    global _PROC_FN
+    if _PROC_FN is None:
+        try:
+            from radgraph import get_radgraph_processed_annotations
+            _PROC_FN = get_radgraph_processed_annotations
+        except Exception:
+            # helper not installed / available
+            _PROC_FN = False
+    return _PROC_FN or None
+
+# torch module, resolved once on first use (False if unavailable)
+_TORCH = None
+
+def _get_torch():
+    """
+    Return the torch module, or None if it cannot be imported.
+    torch is a heavy import; it is only pulled in when a model is loaded or run.
+    """
+    global _TORCH
+    if _TORCH is None:
+        try:
+            import torch
+            _TORCH = torch
+        except Exception:
+            _TORCH = False
+    return _TORCH or None
+
+def _select_autocast_dtype():
+    """
+    Pick the reduced-precision dtype for CUDA inference: bfloat16 on GPUs with native
+    support (compute capability 8.0+, i.e. Ampere or newer), otherwise None (float32).
+    float16 is never used: the DyGIE heads mask scores with -1e20, which overflows Half.
+    Also None on CPU, where half precision is slower than float32.
+    """
+    torch = _get_torch()
+    if torch is None or not torch.cuda.is_available():
+        return None
+    # is_bf16_supported() also reports True for emulated bf16 on sm_70/75
+    if torch.cuda.get_device_capability()[0] >= 8:
+        return torch.bfloat16
+    return None
+
+@contextlib.contextmanager
+def _inference_context(radgraph_model):
+    """
+    Context manager wrapping a forward pass of the RadGraph wrapper: autograd off via
+    inference_mode (no grad metadata or version counters), plus autocast to the precision
+    selected at load time, if any.
+    """
+    torch = _get_torch()
+    if torch is None:
+        yield
+        return
+    dtype = getattr(radgraph_model, "autocast_dtype", None)
+    with torch.inference_mode():
+        if dtype is None:
+            yield
+        else:
+            with torch.autocast(device_type="cuda", dtype=dtype):
+                yield
+
 def ensure_hf_auth():
     """
     Ensure huggingface_hub is authenticated either via HUGGINGFACEHUB_API_TOKEN env var
@@ -43,13 +119,138 @@ def ensure_hf_auth():
         logger.exception("Failed to login to Hugging Face hub with provided token: %s", e)
         return False
 
-def load_radgraph_model(model_id: str = None):
+# short report for load-time warmups (autocast check, torch.compile's lazy compilation)
+_WARMUP_REPORT = "No acute cardiopulmonary process. Small right pleural effusion."
+
+def _compile_inner_model(rg):
+    """
+    Replace the wrapper's inner module with a torch.compile'd version, in place.
+    Compilation is lazy, so a warmup forward pass runs here: Dynamo/Inductor failures
+    (e.g. no C compiler on the host) then restore the uncompiled module instead of
+    surfacing on every later inference call.
+    """
+    torch = _get_torch()
+    inner = getattr(rg, "model", None)
+    if torch is None or inner is None or not hasattr(torch, "compile"):
+        logger.warning("torch.compile unavailable for this model; running uncompiled.")
+        return
+    # CUDA graphs (reduce-overhead) only help on GPU; report lengths vary, so compile
+    # with dynamic shapes instead of recompiling per input length.
+    mode = "reduce-overhead" if torch.cuda.is_available() else "default"
+    try:
+        rg.model = torch.compile(inner, mode=mode, dynamic=True, fullgraph=False)
+        forward_tokens(rg, tokenize_reports(rg, [_WARMUP_REPORT]))
+        logger.info("Compiled RadGraph model with torch.compile (mode=%s).", mode)
+    except Exception as e:
+        rg.model = inner
+        logger.warning("torch.compile failed (%s); running uncompiled.", e)
+
+class _OrtBackbone:
+    """
+    Callable stand-in for the HF transformer inside the RadGraph embedder, backed by an
+    optimum ONNX Runtime feature-extraction model.
+    """
+    def __init__(self, ort_model, config):
+        self.ort_model = ort_model
+        self.config = config
+
+    def __call__(self, input_ids, attention_mask=None, token_type_ids=None, **kwargs):
+        inputs = {"input_ids": input_ids}
+        # the embedder passes a float mask; the exported graph expects int64
+        if attention_mask is not None:
+            inputs["attention_mask"] = attention_mask.long()
+        if token_type_ids is not None and "token_type_ids" in self.ort_model.input_names:
+            inputs["token_type_ids"] = token_type_ids
+        return self.ort_model(**inputs)
+
+def _use_onnx_backbone(rg):
+    """
+    Export the wrapper's transformer backbone (with its fine-tuned weights) to ONNX and
+    swap it in, in place. The span/relation heads keep running in torch.
+    Returns True if the backbone was replaced.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import PreTrainedModel
+    except Exception:
+        logger.exception("ONNX backend requires 'optimum[onnxruntime]'. Install it or use backend='torch'.")
+        raise
+
+    inner = getattr(rg, "model", None)
+    found = None
+    if inner is not None:
+        found = next(((name, mod) for name, mod in inner.named_modules() if isinstance(mod, PreTrainedModel)), None)
+    if found is None:
+        logger.warning("No Hugging Face transformer found inside the RadGraph model; keeping torch backend.")
+        return False
+    name, backbone = found
+    if getattr(backbone.config, "output_hidden_states", False):
+        logger.warning("Embedder mixes hidden states, which the ONNX export does not return; keeping torch backend.")
+        return False
+
+    torch = _get_torch()
+    provider = "CUDAExecutionProvider" if torch is not None and torch.cuda.is_available() else "CPUExecutionProvider"
+    # export from the in-memory module: the hub checkpoint would lack RadGraph's fine-tuning
+    with tempfile.TemporaryDirectory(prefix="radgraph_onnx_") as export_dir:
+        backbone.save_pretrained(export_dir)
+        ort_model = ORTModelForFeatureExtraction.from_pretrained(export_dir, export=True, provider=provider)
+
+    parent_name, _, attr = name.rpartition(".")
+    parent = inner.get_submodule(parent_name) if parent_name else inner
+    # not an nn.Module, so it has to leave _modules before plain attribute assignment
+    parent._modules.pop(attr)
+    setattr(parent, attr, _OrtBackbone(ort_model, backbone.config))
+    logger.info("Swapped RadGraph backbone for ONNX Runtime (%s).", provider)
+    return True
+
+def _quantize_inner_model(rg):
+    """
+    Apply int8 dynamic quantization to the Linear layers of the wrapper's inner module, in place.
+    """
+    torch = _get_torch()
+    inner = getattr(rg, "model", None)
+    if torch is None or inner is None:
+        return
+    try:
+        from torch.ao.quantization import quantize_dynamic
+        # in place: a copy would briefly double the model's memory footprint
+        quantize_dynamic(inner, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        logger.info("Quantized RadGraph Linear layers to int8.")
+    except Exception as e:
+        logger.warning("int8 dynamic quantization failed (%s); running in float32.", e)
+
+def resolve_quantize(quantize: bool) -> bool:
+    """
+    Return whether int8 quantization actually applies: it is CPU-only, so the flag is
+    a no-op on CUDA hosts. Use this before putting the flag into any cache key.
+    """
+    if not quantize:
+        return False
+    torch = _get_torch()
+    return torch is not None and not torch.cuda.is_available()
+
+def load_radgraph_model(model_id: str = None, half_precision: bool = True, compile_model: bool = False,
+                        backend: str = "torch", quantize: bool = True, *, model_type: str = None):
     """
     Load RadGraph inference wrapper. model_id can be:
       - None (we pick default from env RADGRAPH_MODEL_ID or 'modern-radgraph-xl')
       - A HF repo id or artifact alias supported by radgraph package.
+    model_type is accepted as an alias of model_id (the name RadGraph itself uses).
+    With half_precision (Ampere+ CUDA GPUs only), forward passes run under bfloat16 autocast.
+    With compile_model, the inner module is wrapped with torch.compile (opt-in: loading
+    pays the compilation cost through a warmup pass).
+    backend is 'torch' (default) or 'onnx', which runs the transformer backbone through
+    ONNX Runtime (requires optimum[onnxruntime]).
+    With quantize (CPU only), Linear layers are dynamically quantized to int8.
     Returns an instantiated radgraph RadGraph wrapper.
     """
+    if backend not in ("torch", "onnx"):
+        raise ValueError("backend must be 'torch' or 'onnx', got %r" % (backend,))
+    if model_type is not None:
+        if model_id is not None and model_id != model_type:
+            raise ValueError("model_id=%r and model_type=%r disagree" % (model_id, model_type))
+        model_id = model_type
+
     ensure_hf_auth()
 
     if model_id is None:
@@ -69,6 +270,31 @@ def load_radgraph_model(model_id: str = None):
         logger.exception("RadGraph initialization failed for model_type=%s. Error: %s", model_id, e)
         raise
 
+    # Autocast rather than casting the weights: the span/relation heads build float32
+    # masks internally and would hit dtype mismatches against half-precision weights.
+    rg.autocast_dtype = _select_autocast_dtype() if half_precision else None
+
+    onnx_backbone = backend == "onnx" and _use_onnx_backbone(rg)
+
+    if rg.autocast_dtype is not None:
+        # an op that fails under autocast would fail every batch and the per-string
+        # fallback alike; find out now, before compile's warmup runs under it too
+        try:
+            forward_tokens(rg, tokenize_reports(rg, [_WARMUP_REPORT]))
+            logger.info("Running RadGraph inference with %s autocast.", rg.autocast_dtype)
+        except Exception as e:
+            logger.warning("Inference under %s autocast failed (%s); running in float32.", rg.autocast_dtype, e)
+            rg.autocast_dtype = None
+
+    if resolve_quantize(quantize):
+        _quantize_inner_model(rg)
+
+    if compile_model:
+        if onnx_backbone:
+            logger.info("Skipping torch.compile: the backbone runs in ONNX Runtime.")
+        else:
+            _compile_inner_model(rg)
+
     logger.info("RadGraph model loaded.")
     return rg
 
@@ -95,21 +321,23 @@ def normalize_radgraph_outputs(raw_outputs) -> List[Dict[str, Any]]:
     if isinstance(raw_outputs, list) and len(raw_outputs) == 2 and not isinstance(raw_outputs[0], dict) and isinstance(raw_outputs[1], list):
         raw_outputs = list(raw_outputs[1])
 
+    proc_fn = _get_proc_fn()
     processed = []
     for ro in raw_outputs:
+        # already in processed shape: the helper would only raise on it (or copy it)
+        if isinstance(ro, dict) and isinstance(ro.get('entities'), dict):
+            processed.append(ro)
+            continue
+
         # try to transform via helper if available
-        try:
-            from radgraph import get_radgraph_processed_annotations
+        if proc_fn is not None:
             try:
-                pr = get_radgraph_processed_annotations(ro)
+                pr = proc_fn(ro)
                 processed.append(pr)
                 continue
             except Exception:
                 # helper may raise if ro already processed or is not expected shape
                 pass
-        except Exception:
-            # helper not installed / available
-            pass
 
         # fallback: ensure it's a dict (if not, wrap)
         if isinstance(ro, dict):
@@ -119,23 +347,273 @@ def normalize_radgraph_outputs(raw_outputs) -> List[Dict[str, Any]]:
             processed.append({"raw": ro})
     return processed
 
-def annotate_reports(radgraph_model, reports: List[str]) -> List[Dict[str, Any]]:
+def _split_batch_output(raw_output, reports: List[str]) -> List[Any]:
     """
-    Run the radgraph_model on a list of textual reports and return a list of processed dicts.
-    This function handles wrappers that accept either a list or single string.
+    Split the output of one batched wrapper call into one entry per input report.
+    The upstream RadGraph wrapper returns a dict keyed by the document index ("0", "1", ...)
+    and silently drops documents it failed on (an empty dict when every document failed);
+    each missing index becomes an error entry, and each present one is re-wrapped as a
+    single-document dict so get_radgraph_processed_annotations (which reads doc "0") works
+    per report.
+    """
+    if isinstance(raw_output, dict) and all(str(k).isdigit() for k in raw_output):
+        per_report = []
+        for i, r in enumerate(reports):
+            doc = raw_output.get(str(i))
+            if doc is None:
+                per_report.append({"error": "no output returned for report", "input": r})
+            else:
+                per_report.append({"0": doc})
+        return per_report
+
+    # same (model_obj, [annotations]) shapes normalize_radgraph_outputs recovers
+    if isinstance(raw_output, (list, tuple)) and len(raw_output) == 2 and not isinstance(raw_output[0], dict) \
+            and isinstance(raw_output[1], (list, tuple)) and len(raw_output[1]) == len(reports):
+        raw_output = raw_output[1]
+
+    if isinstance(raw_output, (list, tuple)) and len(raw_output) == len(reports):
+        return list(raw_output)
+
+    if len(reports) == 1:
+        return [raw_output]
+
+    raise ValueError("Cannot align batched output of type %s with %d reports" % (type(raw_output).__name__, len(reports)))
+
+# indexed DyGIE instances keyed by (model_type, report text), most recently used last.
+# Process-local on purpose: the instances' indexers hold the HF tokenizer, which
+# st.cache_data would try to pickle.
+_INSTANCE_CACHE = OrderedDict()
+_INSTANCE_CACHE_SIZE = 1024
+_INSTANCE_CACHE_LOCK = threading.Lock()
+
+def tokenize_reports(radgraph_model, reports: List[str]):
+    """
+    Preprocess and tokenize reports into indexed model instances, without running the model.
+    This is the CPU-side half of RadGraph's forward(); pass the result to forward_tokens.
+    Instances are cached per (model_type, text): tokenization does not depend on
+    quantize/compile/backend, nor on which other reports share the call.
+    Wrappers that do not expose RadGraph's dataset reader get the reports back as a list,
+    which forward_tokens then hands to the wrapper unchanged.
+    """
+    reader = getattr(radgraph_model, "reader", None)
+    model = getattr(radgraph_model, "model", None)
+    if reader is None or model is None:
+        return list(reports)
+
+    from radgraph.utils import preprocess_reports
+    from radgraph.allennlp.data.dataset_readers import AllennlpDataset
+
+    model_type = radgraph_model.model_type
+    # same empty-report handling as RadGraph.forward
+    texts = [r if r else "None" for r in reports]
+    instances = [None] * len(texts)
+    missing = []
+    with _INSTANCE_CACHE_LOCK:
+        for i, text in enumerate(texts):
+            instance = _INSTANCE_CACHE.get((model_type, text))
+            if instance is None:
+                missing.append(i)
+            else:
+                _INSTANCE_CACHE.move_to_end((model_type, text))
+                instances[i] = instance
+
+    if missing:
+        docs = preprocess_reports([texts[i] for i in missing], model_type)
+        for i, doc in zip(missing, docs):
+            instance = reader.text_to_instance(doc)
+            # index_with alone is lazy (fields get indexed in __getitem__, i.e. inside the
+            # model loop); index eagerly so the wordpiece tokenization happens here. The
+            # `indexed` flag turns the later __getitem__ call into a no-op.
+            instance.index_fields(model.vocab)
+            instances[i] = instance
+        with _INSTANCE_CACHE_LOCK:
+            for i in missing:
+                _INSTANCE_CACHE[(model_type, texts[i])] = instances[i]
+            while len(_INSTANCE_CACHE) > _INSTANCE_CACHE_SIZE:
+                _INSTANCE_CACHE.popitem(last=False)
+
+    data = AllennlpDataset(instances)
+    data.index_with(model.vocab)
+    return data
+
+def forward_tokens(radgraph_model, batch):
+    """
+    Run the model on the output of tokenize_reports and return the wrapper-shaped result
+    (a dict keyed by document index).
+    """
+    if isinstance(batch, list):
+        with _inference_context(radgraph_model):
+            return radgraph_model(batch)
+
+    from radgraph.allennlp.data.dataloader import PyTorchDataLoader
+    from radgraph.utils import batch_to_device, postprocess_reports
+
+    model = radgraph_model.model
+    results = []
+    with _inference_context(radgraph_model):
+        # DyGIE runs one document per forward pass
+        for n, tensors in enumerate(PyTorchDataLoader(batch_size=1, dataset=batch)):
+            output_dict = model(**batch_to_device(tensors, radgraph_model.device))
+            result = model.make_output_human_readable(output_dict).to_json()
+            # cached instances keep the doc_key of the call that built them; key by position
+            result["doc_key"] = str(n)
+            results.append(result)
+    return postprocess_reports(results)
+
+def _annotate_batch(radgraph_model, reports: List[str], tokens_future=None, prefetch_future=None) -> List[Any]:
+    """
+    Run a single tokenize + forward pass on a batch of reports, falling back to per-string calls.
+    `tokens_future`, if given, holds tokenize_reports(reports) already running in the background;
+    `prefetch_future` is the background tokenization of the next batch, if any.
+    Returns one raw output per report, in input order.
     """
-    # Prefer to call with list, but be tolerant
     try:
-        raw_outputs = radgraph_model(reports)
+        if tokens_future is not None:
+            tokenized = tokens_future.result()
+        else:
+            tokenized = tokenize_reports(radgraph_model, reports)
+        raw_output = forward_tokens(radgraph_model, tokenized)
+        return _split_batch_output(raw_output, reports)
     except Exception as e:
         logger.warning("Calling radgraph with list failed: %s. Falling back to per-string calls.", e)
+        if prefetch_future is not None:
+            # the wrapper tokenizes with the same process-global HF tokenizer as the
+            # worker thread; concurrent use raises "Already borrowed"
+            wait([prefetch_future])
         raw_outputs = []
         for r in reports:
             try:
-                raw_outputs.append(radgraph_model(r))
+                with _inference_context(radgraph_model):
+                    raw_output = radgraph_model(r)
+                raw_outputs.extend(_split_batch_output(raw_output, [r]))
             except Exception as e2:
                 logger.exception("radgraph failed on a single report: %s", e2)
                 raw_outputs.append({"error": str(e2), "input": r})
+        return raw_outputs
+
+_DEFAULT_BATCH_SIZE = 16
+# kept small: probing costs sum(candidates) + 1 forward passes
+_BATCH_SIZE_CANDIDATES = (8, 16, 32)
+
+def _tune_batch_size(radgraph_model, reports: List[str]) -> int:
+    """
+    Time one call per candidate batch size (copies of the median-length report) and
+    return the size with the highest reports/second. Each probe goes through
+    tokenize_reports + forward_tokens, the same path annotate_reports runs. RadGraph
+    itself runs one document per forward pass, so this only measures per-call overhead.
+    """
+    torch = _get_torch()
+    cuda = torch is not None and torch.cuda.is_available()
+    median = sorted(reports, key=lambda r: len(r.split()))[len(reports) // 2]
+
+    try:
+        # warmup, so CUDA init / lazy compilation is not charged to the first candidate
+        forward_tokens(radgraph_model, tokenize_reports(radgraph_model, [median]))
+    except Exception as e:
+        logger.warning("Batch size warmup failed (%s); using %d.", e, _DEFAULT_BATCH_SIZE)
+        return _DEFAULT_BATCH_SIZE
+
+    best_bs, best_rate = _DEFAULT_BATCH_SIZE, 0.0
+    for bs in _BATCH_SIZE_CANDIDATES:
+        try:
+            if cuda:
+                torch.cuda.synchronize()
+            t0 = time.perf_counter()
+            forward_tokens(radgraph_model, tokenize_reports(radgraph_model, [median] * bs))
+            if cuda:
+                torch.cuda.synchronize()
+            elapsed = time.perf_counter() - t0
+        except Exception as e:
+            # typically out of memory; larger sizes will not do better
+            logger.warning("Batch size probe failed at %d: %s", bs, e)
+            break
+        rate = bs / max(elapsed, 1e-9)
+        logger.info("Batch size %d: %.1f reports/s", bs, rate)
+        if rate > best_rate:
+            best_bs, best_rate = bs, rate
+
+    logger.info("Selected batch size %d.", best_bs)
+    return best_bs
+
+def _resolve_batch_size(radgraph_model, reports: List[str]) -> int:
+    # memoized on the model itself, so differently configured models tune separately
+    tuned = getattr(radgraph_model, "tuned_batch_size", None)
+    if tuned is not None:
+        return tuned
+    if len(reports) < max(_BATCH_SIZE_CANDIDATES):
+        # too few reports to probe every candidate, and a partial probe would be
+        # memoized for all later calls; decide on a later, larger call
+        return _DEFAULT_BATCH_SIZE
+    tuned = _tune_batch_size(radgraph_model, reports)
+    try:
+        radgraph_model.tuned_batch_size = tuned
+    except AttributeError:
+        pass  # wrapper does not take attributes; tune again next time
+    return tuned
+
+def annotate_reports(radgraph_model, reports: List[str], batch_size: Optional[int] = _DEFAULT_BATCH_SIZE,
+                     bucket_by_length: bool = False, pipeline: bool = False) -> List[Dict[str, Any]]:
+    """
+    Run the radgraph_model on a list of textual reports and return a list of processed dicts,
+    one per report and in input order.
+    Reports are dispatched in chunks of `batch_size` so each wrapper call amortizes its
+    per-call overhead over several reports. With batch_size=None, the size is tuned
+    empirically on the first call with enough reports and reused for that model.
+    With `bucket_by_length`, reports are first sorted by word count so each chunk holds
+    reports of similar length, and results are scattered back to the caller's order
+    afterwards. That only saves padding for wrappers that pad a call's inputs to a common
+    length; RadGraph runs one document per forward pass, so for it bucketing just changes
+    which reports share a call (hence off by default).
+    With `pipeline` (CUDA only), the next batch is tokenized on a worker thread while the
+    current one runs; opt-in, since the overlap has not been measured to pay off.
+    This function handles wrappers that accept either a list or single string.
+    """
+    if batch_size is None:
+        batch_size = _resolve_batch_size(radgraph_model, reports)
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    order = list(range(len(reports)))
+    if bucket_by_length and len(reports) > 1:
+        # word count is a cheap proxy for the token count
+        order.sort(key=lambda i: len(reports[i].split()))
+
+    batches = [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+    texts = [[reports[i] for i in idx] for idx in batches]
+
+    # With pipeline on GPU, tokenize batch n+1 on a worker thread while batch n runs on the device.
+    # Tokenization itself mostly holds the GIL: allennlp's mismatched indexer calls
+    # encode_plus once per word from a Python loop. Any overlap comes from the main
+    # thread blocking in CUDA calls (which release the GIL), so the gain is bounded
+    # by how long the device is busy. At most two batches are in flight: the one
+    # being run and the one being tokenized.
+    pipelined = False
+    if pipeline and len(batches) >= 2:
+        torch = _get_torch()
+        pipelined = torch is not None and torch.cuda.is_available()
+
+    raw_outputs = [None] * len(reports)
+    with (ThreadPoolExecutor(max_workers=1) if pipelined else contextlib.nullcontext()) as executor:
+        pending = executor.submit(tokenize_reports, radgraph_model, texts[0]) if executor else None
+        for n, idx in enumerate(batches):
+            upcoming = None
+            if executor is not None and n + 1 < len(batches):
+                upcoming = executor.submit(tokenize_reports, radgraph_model, texts[n + 1])
+            batch_outputs = _annotate_batch(radgraph_model, texts[n], pending, upcoming)
+            pending = upcoming
+            for i, out in zip(idx, batch_outputs):
+                raw_outputs[i] = out
 
     normalized = normalize_radgraph_outputs(raw_outputs)
     return normalized
+
+def release_model_memory():
+    """
+    Reclaim memory after the last reference to a loaded model has been dropped:
+    run the garbage collector and return cached CUDA blocks to the driver.
+    """
+    gc.collect()
+    torch = _get_torch()
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    logger.info("Released model memory.")
@@ -0,0 +1,90 @@
+import contextlib
+import threading
+import types
+
+import pytest
+
+pytest.importorskip("huggingface_hub")
+
+import radgraph_runner
+
+
+def _dropping_wrapper(reports):
+    # mimics RadGraph: a dict keyed by doc index, with failed documents left out
+    if isinstance(reports, str):
+        reports = [reports]
+    return {str(i): {"text": r, "entities": {}} for i, r in enumerate(reports) if r != "bad"}
+
+
+@pytest.mark.parametrize("reports", [["bad"], ["ok", "bad"], ["bad", "bad"]])
+def test_dropped_documents_become_error_entries(reports):
+    outputs = radgraph_runner.annotate_reports(_dropping_wrapper, reports)
+
+    assert len(outputs) == len(reports)
+    for report, out in zip(reports, outputs):
+        if report == "bad":
+            assert out == {"error": "no output returned for report", "input": "bad"}
+        else:
+            assert "error" not in out
+
+
+def _list_wrapper(reports):
+    if isinstance(reports, str):
+        reports = [reports]
+    return [{"text": r, "entities": {}} for r in reports]
+
+
+def _tuple_wrapper(reports):
+    return (object(), _list_wrapper(reports))
+
+
+@pytest.mark.parametrize("wrapper", [_list_wrapper, _tuple_wrapper])
+@pytest.mark.parametrize("reports, batch_size", [(["a"], 16), (["a", "b", "c"], 2)])
+def test_list_and_tuple_outputs_are_unwrapped(wrapper, reports, batch_size):
+    outputs = radgraph_runner.annotate_reports(wrapper, reports, batch_size=batch_size)
+
+    assert outputs == [{"text": r, "entities": {}} for r in reports]
+
+
+def _string_only_wrapper(reports):
+    # forces annotate_reports onto its per-string fallback
+    if not isinstance(reports, str):
+        raise TypeError("expected a single report")
+    return _list_wrapper(reports)
+
+
+def _fake_cuda_torch():
+    return types.SimpleNamespace(cuda=types.SimpleNamespace(is_available=lambda: True),
+                                 inference_mode=contextlib.nullcontext)
+
+
+@pytest.mark.parametrize("wrapper", [_list_wrapper, _string_only_wrapper])
+def test_pipeline_tokenizes_ahead_on_a_worker_thread(monkeypatch, wrapper):
+    monkeypatch.setattr(radgraph_runner, "_get_torch", _fake_cuda_torch)
+    tokenize = radgraph_runner.tokenize_reports
+    threads = []
+
+    def spy(model, reports):
+        threads.append(threading.current_thread())
+        return tokenize(model, reports)
+
+    monkeypatch.setattr(radgraph_runner, "tokenize_reports", spy)
+    reports = ["a", "b", "c", "d", "e"]
+    outputs = radgraph_runner.annotate_reports(wrapper, reports, batch_size=2, pipeline=True)
+
+    assert outputs == [{"text": r, "entities": {}} for r in reports]
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
+
+
+def test_auto_batch_size_is_tuned_only_with_enough_reports(monkeypatch):
+    calls = []
+    monkeypatch.setattr(radgraph_runner, "forward_tokens", lambda model, batch: calls.append(len(batch)) or {})
+    model = types.SimpleNamespace()
+
+    assert radgraph_runner._resolve_batch_size(model, ["a"] * 8) == radgraph_runner._DEFAULT_BATCH_SIZE
+    assert calls == [] and not hasattr(model, "tuned_batch_size")
+
+    tuned = radgraph_runner._resolve_batch_size(model, ["a"] * max(radgraph_runner._BATCH_SIZE_CANDIDATES))
+    assert calls == [1] + list(radgraph_runner._BATCH_SIZE_CANDIDATES)
+    assert model.tuned_batch_size == tuned